@@ -151,3 +151,73 @@ end Types_To;
     assert "when Types_From.Alpha => Types_To.Alpha" in body
     assert "when Types_From.Gamma => Types_To.Gamma" in body
     assert "when Types_From.C_Delta => Types_To.Delta" in body
+
+
+def test_empty_enum_map_on_non_enum_fields_is_accepted(tmp_path: Path):
+    # An empty enum_map has nothing to check, so it is not reported even on
+    # record, array or integer fields; a non-empty one still is
+    write(
+        tmp_path / "src/types_from.ads",
+        """
+package Types_From is
+   type Int is range 0 .. 100;
+   type Speed is record
+      North : Int;
+   end record;
+   type Arr is array (1 .. 3) of Int;
+   type Rec_From is record
+      Speed : Speed;
+      Items : Arr;
+      Count : Int;
+   end record;
+end Types_From;
+""".strip(),
+    )
+    write(
+        tmp_path / "src/types_to.ads",
+        """
+package Types_To is
+   type Int is range 0 .. 100;
+   type Speed is record
+      North : Int;
+   end record;
+   type Arr is array (1 .. 3) of Int;
+   type Rec_To is record
+      Speed : Speed;
+      Items : Arr;
+      Count : Int;
+   end record;
+end Types_To;
+""".strip(),
+    )
+    mappings = {
+        "mappings": [
+            {"name": "Speed", "from": "Speed", "to": "Speed", "fields": {"North": "North"}},
+            {
+                "name": "Rec",
+                "from": "Rec_From",
+                "to": "Rec_To",
+                "fields": {
+                    "Speed": {"from": "Speed", "enum_map": {}},
+                    "Items": {"from": "Items", "enum_map": {}},
+                    "Count": {"from": "Count", "enum_map": {}},
+                },
+            },
+        ]
+    }
+    body = run_gen(tmp_path, mappings)
+    assert "function Map (X : Types_From.Rec_From) return Types_To.Rec_To" in body
+    assert "Count => Int (X.Count)" in body
+
+    mappings["mappings"][1]["fields"]["Count"]["enum_map"] = {"A": "B"}
+    mappings_path = tmp_path / "mappings.json"
+    mappings_path.write_text(json.dumps(mappings))
+    result = subprocess.run(
+        [sys.executable, str(Path("tools/gen_mapper.py")), str(mappings_path), str(tmp_path / "src")],
+        cwd=str(Path.cwd()),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode != 0
+    assert "field 'Count' provides 'enum_map'" in result.stderr
+    assert "field 'Speed'" not in result.stderr
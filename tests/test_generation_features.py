@@ -283,3 +283,126 @@ end Types_To;
     assert "function Map (X : Types_From.Wrap_From) return Types_To.Pos_To" in body
     assert "X => I16 (X.P.X)" in body
     assert "Y => I16 (X.P.Y)" in body
+
+
+SIMPLE_TO_SPEC = """
+package Types_To is
+   type Scalar is range -32768 .. 32767;
+   type Rec_To is record
+      A : Scalar;
+   end record;
+   type Two_To is record
+      C : Scalar;
+   end record;
+end Types_To;
+""".strip()
+
+SIMPLE_MAPPINGS = {
+    "mappings": [
+        {"name": "Rec", "from": "Rec_From", "to": "Rec_To", "fields": {"A": "A"}},
+        {"name": "Two", "from": "Two_From", "to": "Two_To", "fields": {"C": "C"}},
+    ]
+}
+
+
+def assert_simple_maps(body: str) -> None:
+    assert "function Map (X : Types_From.Rec_From) return Types_To.Rec_To" in body
+    assert "A => Scalar (X.A)" in body
+    assert "function Map (X : Types_From.Two_From) return Types_To.Two_To" in body
+    assert "C => Scalar (X.C)" in body
+
+
+def test_upper_case_keywords(tmp_path: Path):
+    write(
+        tmp_path / "src/types_from.ads",
+        """
+PACKAGE Types_From IS
+   TYPE Scalar IS RANGE -2147483648 .. 2147483647;
+   TYPE Rec_From IS RECORD
+      A : Scalar;
+   End Record;
+   Type Two_From Is Record
+      C : Scalar;
+   END RECORD;
+END Types_From;
+""".strip(),
+    )
+    write(tmp_path / "src/types_to.ads", SIMPLE_TO_SPEC)
+    assert_simple_maps(run_gen(tmp_path, SIMPLE_MAPPINGS))
+
+
+def test_crlf_line_endings(tmp_path: Path):
+    spec = """
+package Types_From is
+   type Scalar is range -2147483648 .. 2147483647;
+   type Rec_From is record
+      A : Scalar;
+   end record;
+   type Two_From is record
+      C : Scalar;
+   end record;
+end Types_From;
+""".strip()
+    (tmp_path / "src").mkdir(parents=True)
+    (tmp_path / "src/types_from.ads").write_bytes(spec.replace("\n", "\r\n").encode())
+    write(tmp_path / "src/types_to.ads", SIMPLE_TO_SPEC)
+    assert_simple_maps(run_gen(tmp_path, SIMPLE_MAPPINGS))
+
+
+def test_non_ascii_text_that_changes_length_when_lower_cased(tmp_path: Path):
+    # "İ".lower() is two code points, so offsets in a lower-cased copy would drift
+    write(
+        tmp_path / "src/types_from.ads",
+        """
+package Types_From is
+   --  İİİ KONFİGÜRASYON
+   type Scalar is range -2147483648 .. 2147483647;
+   type Rec_From is record
+      A : Scalar;  --  İ
+   end record;
+   type Two_From is record
+      C : Scalar;
+   end record;
+end Types_From;
+""".strip(),
+    )
+    write(tmp_path / "src/types_to.ads", SIMPLE_TO_SPEC)
+    assert_simple_maps(run_gen(tmp_path, SIMPLE_MAPPINGS))
+
+
+def test_record_keyword_on_line_after_is(tmp_path: Path):
+    write(
+        tmp_path / "src/types_from.ads",
+        """
+package Types_From is
+   type Scalar is range -2147483648 .. 2147483647;
+   type Rec_From is
+   record
+      A : Scalar;
+   end record;
+   type Two_From is
+      record
+         C : Scalar;
+      end record;
+end Types_From;
+""".strip(),
+    )
+    write(tmp_path / "src/types_to.ads", SIMPLE_TO_SPEC)
+    assert_simple_maps(run_gen(tmp_path, SIMPLE_MAPPINGS))
+
+
+def test_one_line_record_definition(tmp_path: Path):
+    write(
+        tmp_path / "src/types_from.ads",
+        """
+package Types_From is
+   type Scalar is range -2147483648 .. 2147483647;
+   type Rec_From is record A : Scalar; end record;
+   type Two_From is record
+      C : Scalar;
+   end record;
+end Types_From;
+""".strip(),
+    )
+    write(tmp_path / "src/types_to.ads", SIMPLE_TO_SPEC)
+    assert_simple_maps(run_gen(tmp_path, SIMPLE_MAPPINGS))
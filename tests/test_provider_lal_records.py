@@ -73,3 +73,66 @@ end Types_To;
     assert "A => T_Int16 (X.A)" in body
     assert "B => T_Int16 (X.B)" in body
     assert "C => T_Int16 (X.C)" in body
+
+
+def test_lal_provider_array_field(tmp_path: Path):
+    # Array-typed fields must resolve through the provider (or its regex
+    # fallback) so a dedicated array Map overload is generated
+    src_dir = tmp_path / "src"
+    write(
+        src_dir / "types_from.ads",
+        """
+package Types_From is
+   type T_Int32 is range -2147483648 .. 2147483647;
+   type T_Arr is array (1 .. 4) of T_Int32;
+   type T_From is record
+      A : T_Arr;
+   end record;
+end Types_From;
+""".strip(),
+    )
+    write(
+        src_dir / "types_to.ads",
+        """
+package Types_To is
+   type T_Int16 is range -32768 .. 32767;
+   type T_Arr is array (1 .. 4) of T_Int16;
+   type T_To is record
+      A : T_Arr;
+   end record;
+end Types_To;
+""".strip(),
+    )
+    mappings = tmp_path / "mappings.json"
+    mappings.write_text(
+        json.dumps(
+            {
+                "mappings": [
+                    {
+                        "name": "Arrays",
+                        "from": "T_From",
+                        "to": "T_To",
+                        "fields": {"A": "A"},
+                    }
+                ]
+            }
+        )
+    )
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(Path("tools/gen_mapper.py")),
+            str(mappings),
+            str(src_dir),
+            "--provider",
+            "lal",
+        ],
+        cwd=str(Path.cwd()),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr + result.stdout
+    body = (src_dir / "position_mappers.adb").read_text()
+    assert "function Map (A : Types_From.T_Arr)" in body
+    assert "A => Map(X.A)" in body
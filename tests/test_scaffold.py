@@ -351,3 +351,59 @@ end Types_To;
     )
     assert result.returncode != 0
     assert "destination type 'T_Position_To_Station'" in result.stderr
+
+
+def test_update_json_map_writes_stdlib_json_format(tmp_path: Path) -> None:
+    src_dir = tmp_path / "src"
+    write(
+        src_dir / "types_from.ads",
+        """
+package Types_From is
+   type Item is record
+      Value : Integer;
+   end record;
+   type Items is array (1 .. 4) of Item;
+   type Record_From is record
+      Items_Field : Items;
+   end record;
+end Types_From;
+""".strip(),
+    )
+    write(
+        src_dir / "types_to.ads",
+        """
+package Types_To is
+   type Item is record
+      Value : Integer;
+   end record;
+   type Items is array (1 .. 4) of Item;
+   type Record_To is record
+      Items_Field : Items;
+   end record;
+end Types_To;
+""".strip(),
+    )
+
+    mappings = {
+        "mappings": [
+            {
+                "name": "Caf\u00e9 \u2028",
+                "from": "Record_From",
+                "to": "Record_To",
+                "fields": {"Items_Field": "Items_Field"},
+                "scale": 1e20,
+            }
+        ]
+    }
+    mappings_path = tmp_path / "mappings.json"
+    mappings_path.write_text(json.dumps(mappings, indent=2))
+
+    result = run_cli(tmp_path, [str(mappings_path), str(src_dir), "--update-json-map"])
+    assert result.returncode == 0, result.stderr + result.stdout
+    assert "Updated" in result.stdout
+
+    # Output must match the stdlib encoder whether or not orjson is installed
+    text = mappings_path.read_text()
+    assert text == json.dumps(json.loads(text), indent=2) + "\n"
+    assert "Caf\\u00e9 \\u2028" in text
+    assert "1e+20" in text
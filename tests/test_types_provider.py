@@ -0,0 +1,171 @@
+import os
+import re
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tools"))
+
+from types_provider import LibadalangTypesProvider, RegexTypesProvider  # noqa: E402
+
+
+def test_regex_provider_sees_spec_rewritten_with_same_mtime(tmp_path: Path) -> None:
+    spec = tmp_path / "types_from.ads"
+    spec.write_text(
+        """
+package Types_From is
+   type T_A is record
+      X : Integer;
+   end record;
+end Types_From;
+""".strip()
+    )
+    first = RegexTypesProvider(spec, spec)
+    assert first.get_record_fields("from", "T_A") == {"X": "Integer"}
+    stat = spec.stat()
+
+    # Rewrite within the timestamp granularity: same mtime, different size
+    spec.write_text(
+        """
+package Types_From is
+   type T_A is record
+      X : Integer;
+      Y : Integer;
+   end record;
+end Types_From;
+""".strip()
+    )
+    os.utime(spec, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    second = RegexTypesProvider(spec, spec)
+    assert second.get_record_fields("from", "T_A") == {"X": "Integer", "Y": "Integer"}
+
+
+class FakeStaleReferenceError(Exception):
+    pass
+
+
+class FakeNode:
+    """Stand-in libadalang node that goes stale once its unit is reparsed."""
+
+    def __init__(self, unit, **attrs):
+        self._unit = unit
+        self._attrs = attrs
+
+    def __getattr__(self, name):
+        if self._unit.stale:
+            raise FakeStaleReferenceError(name)
+        try:
+            return self._attrs[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class FakeTypeDecl(FakeNode):
+    pass
+
+
+class FakeRecordTypeDef(FakeNode):
+    pass
+
+
+class FakeUnit:
+    def __init__(self, text: str):
+        self.stale = False
+        decls = []
+        for match in re.finditer(r"type (\w+) is record(.*?)end record;", text, re.S):
+            comps = [
+                FakeNode(
+                    self,
+                    f_ids=FakeNode(self, text=field),
+                    f_component_def=FakeNode(
+                        self, f_subtype_indication=FakeNode(self, f_name=FakeNode(self, text=ftype))
+                    ),
+                )
+                for field, ftype in re.findall(r"(\w+) : (\w+);", match.group(2))
+            ]
+            decls.append(
+                FakeTypeDecl(
+                    self,
+                    f_decl_id=FakeNode(self, text=match.group(1)),
+                    f_type_def=FakeRecordTypeDef(self, f_component_list=FakeNode(self, f_components=comps)),
+                )
+            )
+        self.root = FakeNode(self, children=decls)
+
+
+def install_fake_lal(monkeypatch) -> list:
+    calls = []
+
+    class FakeContext:
+        def __init__(self):
+            self.units = {}
+
+        def get_from_file(self, filename, reparse=False):
+            calls.append((filename, reparse))
+            unit = self.units.get(filename)
+            if unit is not None and not reparse:
+                return unit
+            if unit is not None:
+                unit.stale = True
+            unit = self.units[filename] = FakeUnit(Path(filename).read_text())
+            return unit
+
+    fake_lal = types.SimpleNamespace(
+        AnalysisContext=FakeContext, TypeDecl=FakeTypeDecl, RecordTypeDef=FakeRecordTypeDef
+    )
+    monkeypatch.setitem(sys.modules, "libadalang", fake_lal)
+    monkeypatch.setattr(LibadalangTypesProvider, "_shared_ctx", None)
+    monkeypatch.setattr(LibadalangTypesProvider, "_unit_stamps", {})
+    return calls
+
+
+def rewrite_keeping_mtime(path: Path, content: str) -> None:
+    stat = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+LAL_SPEC = """
+package Types_From is
+   type T_A is record
+      X : Integer;
+   end record;
+   type T_B is record
+      Y : Integer;
+   end record;
+end Types_From;
+""".strip()
+
+
+def test_lal_provider_reparses_spec_edited_after_first_load(tmp_path: Path, monkeypatch) -> None:
+    calls = install_fake_lal(monkeypatch)
+    spec = tmp_path / "types_from.ads"
+    spec.write_text(LAL_SPEC)
+
+    first = LibadalangTypesProvider(spec, spec)
+    assert first.get_record_fields("from", "T_A") == {"X": "Integer"}
+    assert LibadalangTypesProvider(spec, spec).get_record_fields("from", "T_A") == {"X": "Integer"}
+
+    rewrite_keeping_mtime(spec, LAL_SPEC.replace("X : Integer;", "X : Integer;\n      Z : Integer;"))
+    second = LibadalangTypesProvider(spec, spec)
+    assert second.get_record_fields("from", "T_A") == {"X": "Integer", "Z": "Integer"}
+    assert [reparse for _, reparse in calls] == [False, False, True]
+
+    # The first provider's index points into the replaced tree; it must
+    # rebuild instead of touching stale nodes or serving old results
+    assert first.get_record_fields("from", "T_B") == {"Y": "Integer"}
+    assert first.get_record_fields("from", "T_A") == {"X": "Integer", "Z": "Integer"}
+
+
+def test_lal_provider_same_file_for_both_domains_survives_reparse(tmp_path: Path, monkeypatch) -> None:
+    install_fake_lal(monkeypatch)
+    spec = tmp_path / "types.ads"
+    spec.write_text(LAL_SPEC)
+
+    provider = LibadalangTypesProvider(spec, spec)
+    assert provider.get_record_fields("from", "T_A") == {"X": "Integer"}
+    rewrite_keeping_mtime(spec, LAL_SPEC.replace("Y : Integer;", "Y : Integer;\n      W : Integer;"))
+    # Loading "to" reparses the shared unit under the "from" index
+    assert provider.get_record_fields("to", "T_B") == {"Y": "Integer", "W": "Integer"}
+    assert provider.get_record_fields("from", "T_B") == {"Y": "Integer", "W": "Integer"}
@@ -33,6 +33,11 @@ from types_provider import RegexTypesProvider
 from constants import DEFAULT_SENTINEL
 from validation import validate_mappings
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 
 SPEC_TEMPLATE_HEADER = """with Types_From;
 with Types_To;
@@ -58,6 +63,20 @@ end Position_Mappers;
 """
 
 
+def read_json(path: Path) -> dict:
+    """Load a mappings file, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text())
+
+
+def write_json(path: Path, data: dict) -> None:
+    """Write a mappings file with 2-space indent and a trailing newline."""
+    # Always the stdlib encoder: orjson differs in non-ASCII escaping and
+    # float formatting, and the file must not depend on what is installed
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
 def gen_function_spec(src_type: str, dst_type: str) -> str:
     return f"   function Map (X : Types_From.{src_type}) return Types_To.{dst_type};\n"
 
@@ -192,20 +211,20 @@ def main():
         except ValueError as exc:
             sys.stderr.write(f"Failed to initialize {mappings_path}: {exc}\n")
             sys.exit(1)
-        mappings_path.write_text(json.dumps(scaffold, indent=2) + "\n")
+        write_json(mappings_path, scaffold)
         print(f"Initialized {mappings_path}")
         return
 
     if args.update_json_map:
         scaffolder = MappingScaffolder(provider)
-        data = json.loads(mappings_path.read_text())
+        data = read_json(mappings_path)
         try:
             changed = scaffolder.update_map(data)
         except ValueError as exc:
             sys.stderr.write(f"Failed to update {mappings_path}: {exc}\n")
             sys.exit(1)
         if changed:
-            mappings_path.write_text(json.dumps(data, indent=2) + "\n")
+            write_json(mappings_path, data)
             print(f"Updated {mappings_path}")
         else:
             print("No changes made to", mappings_path)
@@ -214,7 +233,7 @@ def main():
     spec_path = outdir / "position_mappers.ads"
     body_path = outdir / "position_mappers.adb"
 
-    data = json.loads(mappings_path.read_text())
+    data = read_json(mappings_path)
     mappings = data.get("mappings", [])
     if not mappings:
         print("No mappings found in", mappings_path)
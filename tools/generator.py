@@ -33,6 +33,11 @@ class MapperGenerator:
         self.parsed_from: Dict[str, Dict[str, str]] = {}
         self.parsed_to_lower: Dict[str, Dict[str, str]] = {}
         self.parsed_from_lower: Dict[str, Dict[str, str]] = {}
+        # Base names known not to be records, and array element lookups by raw name
+        self.missing_to: Set[str] = set()
+        self.missing_from: Set[str] = set()
+        self.to_array_elems: Dict[str, Optional[str]] = {}
+        self.from_array_elems: Dict[str, Optional[str]] = {}
 
     def format_record_lines(
         self, parts: List[Tuple[str, str, Optional[str]]], indent: str = "       "
@@ -64,10 +69,14 @@ class MapperGenerator:
             return None
         if base in self.parsed_to:
             return self.parsed_to[base]
+        if base in self.missing_to:
+            return None
         fields = self.provider.get_record_fields("to", base)
         if fields is not None:
             self.parsed_to[base] = fields
             self.parsed_to_lower[base] = {k.lower(): k for k in fields}
+        else:
+            self.missing_to.add(base)
         return fields
 
     def get_from_fields(self, tname: str) -> Optional[Dict[str, str]]:
@@ -78,24 +87,32 @@ class MapperGenerator:
             return None
         if base in self.parsed_from:
             return self.parsed_from[base]
+        if base in self.missing_from:
+            return None
         fields = self.provider.get_record_fields("from", base)
         if fields is not None:
             self.parsed_from[base] = fields
             self.parsed_from_lower[base] = {k.lower(): k for k in fields}
+        else:
+            self.missing_from.add(base)
         return fields
 
     # Arrays
     def to_array_elem(self, tname: Optional[str]) -> Optional[str]:
         if not tname:
             return None
-        base = self._base_type(tname)
-        return self.provider.get_array_element_type("to", base) if base else None
+        if tname not in self.to_array_elems:
+            base = self._base_type(tname)
+            self.to_array_elems[tname] = self.provider.get_array_element_type("to", base) if base else None
+        return self.to_array_elems[tname]
 
     def from_array_elem(self, tname: Optional[str]) -> Optional[str]:
         if not tname:
             return None
-        base = self._base_type(tname)
-        return self.provider.get_array_element_type("from", base) if base else None
+        if tname not in self.from_array_elems:
+            base = self._base_type(tname)
+            self.from_array_elems[tname] = self.provider.get_array_element_type("from", base) if base else None
+        return self.from_array_elems[tname]
 
     # Dotted source path resolution
     def resolve_src_path_type(self, start_type: str, path: str) -> Optional[str]:
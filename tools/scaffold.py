@@ -1,15 +1,24 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Tuple
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple
 import re
+import sys
 
 from constants import DEFAULT_SENTINEL
 from types_provider import TypesProvider
 
 
-@dataclass
+_TOKEN_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+# dataclass(slots=...) needs Python 3.10; older interpreters get a plain dataclass
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class MappingRequest:
     name: str
     to_type: str
@@ -24,6 +33,8 @@ class MappingScaffolder:
         self.provider = provider
         self._processed: set[Tuple[str, str]] = set()
         self._preferred_names: Dict[str, str] = {}
+        self._kind_cache: Dict[Tuple[str, str], Tuple[Optional[str], object]] = {}
+        self._lookup_cache: Dict[Tuple[str, str, str], Dict[str, str]] = {}
 
     @staticmethod
     def _default_name(type_name: str) -> str:
@@ -33,51 +44,59 @@ class MappingScaffolder:
 
     @staticmethod
     def _field_placeholder(field_name: str) -> str:
-        token = re.sub(r"[^A-Za-z0-9]+", "_", field_name.upper()).strip("_")
+        token = _TOKEN_RE.sub("_", field_name.upper()).strip("_")
         if not token:
             token = "FIELD"
         return f"<{token}_INPUT_FIELD>"
 
     @staticmethod
     def _from_placeholder(type_name: str) -> str:
-        token = re.sub(r"[^A-Za-z0-9]+", "_", type_name.upper()).strip("_")
+        token = _TOKEN_RE.sub("_", type_name.upper()).strip("_")
         if not token:
             token = "TYPE"
         return f"<SOURCE_TYPE_FOR_{token}>"
 
     @staticmethod
     def is_placeholder(value: object) -> bool:
-        return isinstance(value, str) and value.startswith("<") and value.endswith(">")
+        return isinstance(value, str) and value[:1] == "<" and value[-1:] == ">"
+
+    @staticmethod
+    def _canonical_request(req: MappingRequest) -> MappingRequest:
+        """Strip and intern the type names of a request once, at enqueue time."""
+        return replace(
+            req,
+            to_type=sys.intern(req.to_type.strip()),
+            from_type=sys.intern(req.from_type.strip()) if req.from_type else None,
+        )
 
     def build_map(self, requests: List[MappingRequest], preferred_names: Optional[Dict[str, str]] = None) -> Dict[str, List[Dict[str, object]]]:
-        queue: List[MappingRequest] = list(requests)
+        requests = [self._canonical_request(req) for req in requests]
+        queue: Deque[MappingRequest] = deque(requests)
         self._processed = set()
+        self._kind_cache = {}
+        self._lookup_cache = {}
         self._preferred_names = dict(preferred_names or {})
         for req in requests:
             self._preferred_names.setdefault(req.to_type, req.name)
-        requested_pairs: Set[Tuple[str, str]] = {
-            ((req.from_type or "").strip(), req.to_type.strip()) for req in requests
-        }
-        requested_targets: Set[str] = {req.to_type.strip() for req in requests}
+        # Nested requests are deduplicated at enqueue time by destination type,
+        # so the queue never holds more than one request per target.
+        requested_targets: Set[str] = {req.to_type for req in requests}
         result: List[Dict[str, object]] = []
 
         while queue:
-            req = queue.pop(0)
-            to_type = req.to_type.strip()
-            from_key = (req.from_type or "").strip()
-            key = (from_key, to_type)
+            req = queue.popleft()
+            key = (req.from_type or "", req.to_type)
             if key in self._processed:
                 continue
             entry, nested_requests = self._build_entry(req)
             self._processed.add(key)
             result.append(entry)
             for nested in nested_requests:
+                nested = self._canonical_request(nested)
                 self._preferred_names.setdefault(nested.to_type, nested.name)
-                nested_key = ((nested.from_type or "").strip(), nested.to_type.strip())
-                if nested.to_type.strip() in requested_targets:
+                if nested.to_type in requested_targets:
                     continue
-                requested_pairs.add(nested_key)
-                requested_targets.add(nested.to_type.strip())
+                requested_targets.add(nested.to_type)
                 queue.append(nested)
 
         return {"mappings": result}
@@ -89,9 +108,12 @@ class MappingScaffolder:
 
         preferred_names = {}
         requests: List[MappingRequest] = []
+        existing_by_to: Dict[str, Dict[str, object]] = {}
         for entry in mappings:
             if not isinstance(entry, dict):
                 continue
+            if entry.get("to"):
+                existing_by_to[str(entry.get("to"))] = entry
             name = str(entry.get("name", "")) or self._default_name(str(entry.get("to", "")))
             to_type = str(entry.get("to", "")).strip()
             if not to_type:
@@ -115,11 +137,13 @@ class MappingScaffolder:
 
         suggestions = self.build_map(requests, preferred_names=preferred_names)["mappings"]
         suggestion_by_to = {entry["to"]: entry for entry in suggestions}
-        existing_by_to = {str(entry.get("to")): entry for entry in mappings if isinstance(entry, dict) and entry.get("to")}
 
         changed = False
         for to_type, suggestion in suggestion_by_to.items():
             existing = existing_by_to.get(to_type)
+            if existing == suggestion:
+                # Already up to date; nothing to merge
+                continue
             if existing:
                 # update 'from'
                 sugg_from = suggestion.get("from")
@@ -143,28 +167,25 @@ class MappingScaffolder:
                 # update fields selectively
                 existing_fields = existing.setdefault("fields", {})
                 if isinstance(existing_fields, dict):
+                    is_placeholder = self.is_placeholder
                     for field_name, sugg_value in suggestion.get("fields", {}).items():
                         current_value = existing_fields.get(field_name)
-                        if isinstance(sugg_value, dict):
-                            if not isinstance(current_value, dict) or current_value != sugg_value:
-                                existing_fields[field_name] = sugg_value
-                                changed = True
-                            continue
-                        if isinstance(sugg_value, str) and not self.is_placeholder(sugg_value):
-                            if current_value != sugg_value:
-                                existing_fields[field_name] = sugg_value
-                                changed = True
+                        if is_placeholder(sugg_value):
+                            # Only reset to a placeholder if the field is not one already
+                            outdated = not is_placeholder(current_value)
+                        elif isinstance(sugg_value, (str, dict)):
+                            outdated = current_value != sugg_value
+                        else:
                             continue
-                        if isinstance(sugg_value, str) and self.is_placeholder(sugg_value):
-                            if not isinstance(current_value, str) or not self.is_placeholder(current_value):
-                                existing_fields[field_name] = sugg_value
-                                changed = True
+                        if outdated:
+                            existing_fields[field_name] = sugg_value
+                            changed = True
             else:
                 mappings.append(suggestion)
                 changed = True
 
         # Remove entries that are no longer suggested at all
-        obsolete = set(existing_by_to.keys()) - set(suggestion_by_to.keys())
+        obsolete = existing_by_to.keys() - suggestion_by_to.keys()
         if obsolete:
             new_list = [entry for entry in mappings if str(entry.get("to")) not in obsolete]
             if len(new_list) != len(mappings):
@@ -174,19 +195,20 @@ class MappingScaffolder:
         return changed
 
     def _build_entry(self, req: MappingRequest) -> Tuple[Dict[str, object], List[MappingRequest]]:
-        to_type = req.to_type.strip()
-        dest_fields_raw = self.provider.get_record_fields("to", to_type)
-        dest_fields = dest_fields_raw or {}
-        dest_enum_literals = self.provider.get_enum_literals("to", to_type) or []
+        to_type = req.to_type
+        # Nested destination types were already classified by the parent entry
+        to_kind, to_payload = self._classify("to", to_type)
+        dest_fields = to_payload if to_kind == "record" else {}
+        dest_enum_literals = to_payload if to_kind == "enum" else []
 
-        if dest_fields_raw is None and not dest_enum_literals:
+        if to_kind not in ("record", "enum"):
             raise ValueError(
                 f"Unable to scaffold mapping '{req.name}': destination type '{to_type}' is not a record or enum in destination specs"
             )
 
         existing_fields = req.existing_fields or {}
 
-        source_type = req.from_type.strip() if req.from_type else None
+        source_type = req.from_type or None
         if source_type and not self._has_supported_type("from", source_type):
             source_type = None
         if not source_type and self._has_supported_type("from", to_type):
@@ -195,12 +217,7 @@ class MappingScaffolder:
         # Enum mapping entry
         if dest_enum_literals and not dest_fields:
             from_value = source_type if source_type else self._from_placeholder(to_type)
-            src_literals = (
-                self.provider.get_enum_literals("from", source_type)
-                if source_type
-                else None
-            ) or []
-            src_lookup = {lit.lower(): lit for lit in src_literals}
+            src_lookup = self._literal_lookup("from", source_type) if source_type else {}
             fields: Dict[str, object] = {}
             for lit in dest_enum_literals:
                 existing = existing_fields.get(lit)
@@ -218,15 +235,16 @@ class MappingScaffolder:
             return entry, []
 
         from_value = source_type if source_type else self._from_placeholder(to_type)
-        from_fields_raw = self.provider.get_record_fields("from", source_type) if source_type else None
-        from_fields = from_fields_raw or {}
-        from_lookup = {name.lower(): name for name in from_fields.keys()}
+        from_kind, from_payload = self._classify("from", source_type) if source_type else (None, None)
+        from_fields = from_payload if from_kind == "record" else {}
+        from_lookup = self._field_lookup("from", source_type) if source_type else {}
 
         fields: Dict[str, object] = {}
         nested_requests: List[MappingRequest] = []
 
         for dest_name, dest_mark_raw in dest_fields.items():
             dest_mark = dest_mark_raw.strip()
+            dest_key = dest_name.lower()
             existing_spec = existing_fields.get(dest_name)
             src_name = None
             src_mark = None
@@ -260,18 +278,10 @@ class MappingScaffolder:
                             src_mark = None
                 else:
                     existing_spec = None
-            else:
-                if dest_name.lower() in from_lookup:
-                    candidate = from_lookup[dest_name.lower()]
-                    candidate_mark = from_fields.get(candidate)
-                    if candidate_mark and self._types_compatible(dest_mark, candidate_mark):
-                        src_name = candidate
-                        src_mark = candidate_mark
-                        spec_value = candidate
 
             if spec_value is None:
-                if src_name is None and dest_name.lower() in from_lookup:
-                    candidate = from_lookup[dest_name.lower()]
+                if src_name is None and dest_key in from_lookup:
+                    candidate = from_lookup[dest_key]
                     candidate_mark = from_fields.get(candidate)
                     if candidate_mark and self._types_compatible(dest_mark, candidate_mark):
                         src_name = candidate
@@ -280,9 +290,8 @@ class MappingScaffolder:
                 if spec_value is None:
                     spec_value = self._field_placeholder(dest_name)
 
-            dest_record_fields = self.provider.get_record_fields("to", dest_mark)
-            elem_type = self.provider.get_array_element_type("to", dest_mark)
-            dest_enum = self.provider.get_enum_literals("to", dest_mark)
+            dest_kind, dest_payload = self._classify("to", dest_mark)
+            elem_type = dest_payload if dest_kind == "array" else None
 
             if (
                 isinstance(spec_value, str)
@@ -332,53 +341,47 @@ class MappingScaffolder:
                 continue
 
             src_mark_clean = src_mark.strip() if isinstance(src_mark, str) else None
-            src_record_fields = (
-                self.provider.get_record_fields("from", src_mark_clean)
-                if src_mark_clean
-                else None
+            src_kind, src_payload = (
+                self._classify("from", src_mark_clean) if src_mark_clean else (None, None)
             )
-            if dest_record_fields is not None:
-                nested_from_type = src_mark.strip() if src_mark else None
-                if nested_from_type and not self.provider.get_record_fields("from", nested_from_type):
-                    nested_from_type = None
-                if not nested_from_type and self.provider.get_record_fields("from", dest_mark):
+            if dest_kind == "record":
+                nested_from_type = src_mark_clean if src_kind == "record" and src_payload else None
+                if not nested_from_type and self._has_fields("from", dest_mark):
                     nested_from_type = dest_mark
                 nested_name = self._preferred_names.get(dest_mark) or self._default_name(dest_mark)
                 nested_requests.append(MappingRequest(name=nested_name, to_type=dest_mark, from_type=nested_from_type))
                 continue
-            if src_record_fields is not None:
+            if src_kind == "record":
                 raise ValueError(
                     f"Unable to scaffold mapping '{req.name}': field '{dest_name}' references destination type '{dest_mark}' which could not be parsed as a record"
                 )
 
             # Nested array mapping (focus on element records)
             if elem_type:
-                src_elem_type = None
-                if src_mark:
-                    src_elem_type = self.provider.get_array_element_type("from", src_mark.strip())
+                src_elem_type = src_payload if src_kind == "array" else None
                 if src_elem_type and not self._has_supported_type("from", src_elem_type):
                     src_elem_type = None
-                if not src_elem_type and self.provider.get_record_fields("from", elem_type):
+                if not src_elem_type and self._has_fields("from", elem_type):
                     src_elem_type = elem_type
-                if self.provider.get_record_fields("to", elem_type):
+                if self._has_fields("to", elem_type):
                     nested_name = self._preferred_names.get(elem_type) or self._default_name(elem_type)
                     nested_requests.append(
                         MappingRequest(name=nested_name, to_type=elem_type, from_type=src_elem_type)
                     )
                 continue
-            if src_mark_clean and self.provider.get_array_element_type("from", src_mark_clean):
+            if src_kind == "array":
                 raise ValueError(
                     f"Unable to scaffold mapping '{req.name}': field '{dest_name}' references destination array type '{dest_mark}' which could not be parsed"
                 )
 
             # Enum mapping scaffold
-            if dest_enum:
+            if dest_kind == "enum":
                 src_enum_type = None
-                if src_mark and self.provider.get_enum_literals("from", src_mark.strip()):
-                    src_enum_type = src_mark.strip()
-                elif source_type and self.provider.get_enum_literals("from", source_type):
+                if src_kind == "enum":
+                    src_enum_type = src_mark_clean
+                elif source_type and self._classify("from", source_type)[0] == "enum":
                     src_enum_type = source_type
-                elif self.provider.get_enum_literals("from", dest_mark):
+                elif self._classify("from", dest_mark)[0] == "enum":
                     src_enum_type = dest_mark
                 nested_name = self._preferred_names.get(dest_mark) or self._default_name(dest_mark)
                 nested_fields = None
@@ -393,7 +396,7 @@ class MappingScaffolder:
                     )
                 )
                 continue
-            if src_mark_clean and self.provider.get_enum_literals("from", src_mark_clean):
+            if src_kind == "enum":
                 raise ValueError(
                     f"Unable to scaffold mapping '{req.name}': field '{dest_name}' references destination enum type '{dest_mark}' which could not be parsed"
                 )
@@ -446,57 +449,95 @@ class MappingScaffolder:
         target_array_canon = self._canonical_name(dest_array_type)
         target_elem_canon = self._canonical_name(dest_element_type)
         dest_field_canon = self._canonical_name(dest_field_name)
-        visited: Set[str] = set()
-
-        def visit(type_name: str, prefix: str) -> Optional[Tuple[str, str, int]]:
-            fields = self.provider.get_record_fields("from", type_name)
-            if not fields:
-                return None
-            best: Optional[Tuple[str, str, int]] = None
-            for field, mark in fields.items():
-                mark_clean = mark.strip()
-                path = f"{prefix}{field}" if prefix else field
-                array_elem = self.provider.get_array_element_type("from", mark_clean)
-                if array_elem:
-                    field_canon = self._canonical_name(field)
-                    array_canon = self._canonical_name(mark_clean)
-                    elem_canon = self._canonical_name(array_elem)
-                    score = 0
-                    if field_canon == dest_field_canon:
-                        score = 3
-                    elif array_canon == target_array_canon:
-                        score = 2
-                    elif target_elem_canon and elem_canon == target_elem_canon:
-                        score = 1
-                    if score > 0:
-                        candidate = (path, mark_clean, score)
-                        if not best or candidate[2] > best[2]:
-                            best = candidate
-                record_fields = self.provider.get_record_fields("from", mark_clean)
-                if record_fields is not None and mark_clean not in visited:
-                    visited.add(mark_clean)
-                    child = visit(mark_clean, f"{path}.")
-                    if child and (not best or child[2] > best[2]):
-                        best = child
-            return best
-
-        visited.add(source_type)
-        result = visit(source_type, "")
-        if result:
-            return result[0], result[1]
+        visited: Set[str] = {source_type}
+        best: Optional[Tuple[str, str, int]] = None
+
+        # Iterative preorder walk over nested source records. A candidate
+        # only replaces the current best on a strictly higher score, so the
+        # first match in declaration order wins ties.
+        root_fields = self.provider.get_record_fields("from", source_type) or {}
+        stack: List[Tuple[Iterator[Tuple[str, str]], str]] = [(iter(root_fields.items()), "")]
+        while stack:
+            fields_iter, prefix = stack[-1]
+            item = next(fields_iter, None)
+            if item is None:
+                stack.pop()
+                continue
+            field, mark = item
+            mark_clean = mark.strip()
+            path = f"{prefix}{field}"
+            kind, payload = self._classify("from", mark_clean)
+            if kind == "array":
+                score = 0
+                if self._canonical_name(field) == dest_field_canon:
+                    score = 3
+                elif self._canonical_name(mark_clean) == target_array_canon:
+                    score = 2
+                elif target_elem_canon and self._canonical_name(payload) == target_elem_canon:
+                    score = 1
+                if score > 0 and (not best or score > best[2]):
+                    best = (path, mark_clean, score)
+            elif kind == "record" and mark_clean not in visited:
+                visited.add(mark_clean)
+                stack.append((iter(payload.items()), f"{path}."))
+
+        if best:
+            return best[0], best[1]
         return None
 
+    def _field_lookup(self, domain: str, type_name: str) -> Dict[str, str]:
+        """Return a cached lower-case -> declared-name map of record fields."""
+        key = ("record", domain, type_name)
+        lookup = self._lookup_cache.get(key)
+        if lookup is None:
+            fields = self.provider.get_record_fields(domain, type_name) or {}
+            lookup = {name.lower(): name for name in fields}
+            self._lookup_cache[key] = lookup
+        return lookup
+
+    def _literal_lookup(self, domain: str, type_name: str) -> Dict[str, str]:
+        """Return a cached lower-case -> declared-name map of enum literals."""
+        key = ("enum", domain, type_name)
+        lookup = self._lookup_cache.get(key)
+        if lookup is None:
+            literals = self.provider.get_enum_literals(domain, type_name) or []
+            lookup = {lit.lower(): lit for lit in literals}
+            self._lookup_cache[key] = lookup
+        return lookup
+
     def _has_supported_type(self, domain: str, type_name: str) -> bool:
         if not type_name:
             return False
+        return self._classify(domain, type_name)[0] is not None
+
+    def _has_fields(self, domain: str, type_name: str) -> bool:
+        kind, payload = self._classify(domain, type_name)
+        return kind == "record" and bool(payload)
+
+    def _classify(self, domain: str, type_name: str) -> Tuple[Optional[str], object]:
+        """Return the cached (kind, payload) of a type.
+
+        kind is "record" (payload: fields), "array" (payload: element type),
+        "enum" (payload: literals) or None for scalars and unknown types.
+        """
+        key = (domain, type_name)
+        cached = self._kind_cache.get(key)
+        if cached is not None:
+            return cached
+        result: Tuple[Optional[str], object] = (None, None)
         record_fields = self.provider.get_record_fields(domain, type_name)
         if record_fields is not None:
-            return True
-        if self.provider.get_array_element_type(domain, type_name):
-            return True
-        if self.provider.get_enum_literals(domain, type_name):
-            return True
-        return False
+            result = ("record", record_fields)
+        else:
+            elem_type = self.provider.get_array_element_type(domain, type_name)
+            if elem_type:
+                result = ("array", elem_type)
+            else:
+                literals = self.provider.get_enum_literals(domain, type_name)
+                if literals:
+                    result = ("enum", literals)
+        self._kind_cache[key] = result
+        return result
 
     def _entry_all_placeholders(self, entry: Dict[str, object]) -> bool:
         from_value = entry.get("from")
@@ -533,10 +574,4 @@ class MappingScaffolder:
         type_name = type_name.strip()
         if not type_name:
             return None
-        if self.provider.get_record_fields(domain, type_name) is not None:
-            return "record"
-        if self.provider.get_array_element_type(domain, type_name):
-            return "array"
-        if self.provider.get_enum_literals(domain, type_name):
-            return "enum"
-        return "scalar"
+        return self._classify(domain, type_name)[0] or "scalar"
@@ -1,23 +1,86 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Protocol, List, Callable, Any, Tuple
+from typing import Optional, Dict, Protocol, List, Callable, Any, Tuple, Iterator
 import re
+import sys
 
 
 QUALIFIER_RE = re.compile(r"\b(?:aliased|not\s+null|access|constant)\b", re.IGNORECASE)
-PACKAGE_START_RE = re.compile(r"^\s*package\s+([A-Za-z0-9_.]+)\s+is\b", re.IGNORECASE)
-PACKAGE_END_RE = re.compile(r"^\s*end\s+([A-Za-z0-9_.]+)?\s*;", re.IGNORECASE)
-SUBTYPE_RE = re.compile(r"^\s*subtype\s+([A-Za-z]\w*)\s+is\s+(.+?);", re.IGNORECASE)
-TYPE_DECL_RE = re.compile(r"^\s*type\s+([A-Za-z]\w*)\s+is\b(.*)$", re.IGNORECASE)
+_QUALIFIER_WORDS = ("aliased", "null", "access", "constant")
+# Whitespace that does not cross a line break, so every declaration
+# alternative below stays within the line it starts on.
+_LINE_WS = r"[^\S\n]"
+# DECL_SCAN_RE, RECORD_KW_RE and END_RECORD_RE are case-sensitive: they run
+# on a lower-cased copy of the spec, and captures are sliced from the
+# original text by offset.
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+DECL_SCAN_RE = re.compile(
+    rf"^{_LINE_WS}*(?:"
+    rf"(?P<package>package{_LINE_WS}+(?P<package_name>[A-Za-z0-9_.]+){_LINE_WS}+is\b)"
+    rf"|(?P<end>end{_LINE_WS}+(?P<end_name>[A-Za-z0-9_.]+)?{_LINE_WS}*;)"
+    rf"|(?P<subtype>subtype{_LINE_WS}+(?P<subtype_name>[A-Za-z]\w*){_LINE_WS}+is{_LINE_WS}+(?P<subtype_base>.+?);)"
+    rf"|(?P<type>type{_LINE_WS}+(?P<type_name>[A-Za-z]\w*){_LINE_WS}+is\b.*$)"
+    r")",
+    re.MULTILINE,
+)
 FIELD_RE = re.compile(r"^\s*([A-Za-z]\w*)\s*:\s*([^;]+);")
-ENUM_CLOSE_RE = re.compile(r"\)\s*;")
 ARRAY_BODY_RE = re.compile(
     r"\bis\s+array\s*\((.*?)\)\s*of\s+(.+);",
     re.IGNORECASE | re.DOTALL,
 )
 ENUM_BODY_RE = re.compile(r"\bis\s*\((.*)\)\s*;", re.IGNORECASE | re.DOTALL)
+RECORD_KW_RE = re.compile(r"\brecord\b")
+END_RECORD_RE = re.compile(r"\bend[^\S\n]+record[^\S\n]*;")
+RECORD_BODY_RE = re.compile(r"\brecord\b(.*?)\bend\s+record", re.IGNORECASE | re.DOTALL)
+
+
+@lru_cache(maxsize=8192)
+def _clean_reference_cached(ref: str) -> str:
+    lowered = ref.lower()
+    if "--" not in ref and not any(kw in lowered for kw in _QUALIFIER_WORDS):
+        # Plain type marks only need whitespace normalization
+        return " ".join(ref.split())
+    cleaned = ref.split("--", 1)[0]
+    cleaned = QUALIFIER_RE.sub("", cleaned)
+    cleaned = " ".join(cleaned.split())
+    return cleaned.strip()
+
+
+@lru_cache(maxsize=8192)
+def _normalize_name_cached(name: str, root: Optional[str]) -> str:
+    cleaned = _clean_reference_cached(name)
+    if not cleaned:
+        return cleaned
+    cleaned = cleaned.split("(", 1)[0].strip()
+    if root and cleaned.startswith(root + "."):
+        cleaned = cleaned[len(root) + 1 :]
+    return sys.intern(cleaned)
+
+
+# Spec text shared by every provider in the process: resolved path -> (stamp, text)
+_TEXT_CACHE: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+
+
+def _file_stamp(path: Path) -> Tuple[int, int]:
+    """Return (mtime_ns, size); size catches rewrites within the timestamp granularity."""
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_spec_text(path: Path) -> str:
+    """Return the text of ``path``, reusing an earlier read while the file is unchanged."""
+    resolved = path.resolve()
+    stamp = _file_stamp(resolved)
+    cached = _TEXT_CACHE.get(resolved)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    text = resolved.read_text()
+    _TEXT_CACHE[resolved] = (stamp, text)
+    return text
 
 
 class TypesProvider(Protocol):
@@ -39,7 +102,7 @@ class AdaSpecIndex:
 
     def __init__(self, path: Path) -> None:
         self.path = path
-        self.text = path.read_text()
+        self.text = _read_spec_text(path)
         self.root: Optional[str] = None
         self.records: Dict[str, Dict[str, str]] = {}
         self.arrays: Dict[str, str] = {}
@@ -48,6 +111,7 @@ class AdaSpecIndex:
         self.subtypes: Dict[str, str] = {}
         self.declared_types: set[str] = set()
         self._parse()
+        self._flatten_subtypes()
 
     def _current_segments(self, stack: List[str]) -> List[str]:
         if not stack:
@@ -57,16 +121,14 @@ class AdaSpecIndex:
         return stack[:]
 
     def _qualified_name(self, stack: List[str], name: str) -> str:
+        # Table keys are interned so lookups by normalized names compare by identity
         segments = self._current_segments(stack)
         if segments:
-            return ".".join(segments + [name])
-        return name
+            return sys.intern(".".join(segments + [name]))
+        return sys.intern(name)
 
     def _clean_reference(self, ref: str) -> str:
-        cleaned = ref.split("--", 1)[0]
-        cleaned = QUALIFIER_RE.sub("", cleaned)
-        cleaned = " ".join(cleaned.split())
-        return cleaned.strip()
+        return _clean_reference_cached(ref)
 
     def _qualify_name(self, base: str, pkg_segments: List[str]) -> str:
         base = base.strip()
@@ -93,41 +155,49 @@ class AdaSpecIndex:
         qualified_base = self._qualify_name(base.strip(), pkg_segments)
         if suffix:
             return f"{qualified_base} {suffix}"
-        return qualified_base
+        return sys.intern(qualified_base)
 
     def normalize_name(self, name: str) -> str:
-        cleaned = self._clean_reference(name)
-        if not cleaned:
-            return cleaned
-        cleaned = cleaned.split("(", 1)[0].strip()
-        if self.root and cleaned.startswith(self.root + "."):
-            cleaned = cleaned[len(self.root) + 1 :]
-        return cleaned
-
-    def _collect_type_block(self, lines: List[str], start_idx: int) -> tuple[str, int]:
-        block_lines: List[str] = []
-        record_seen = False
-        i = start_idx
-        while i < len(lines):
-            line = lines[i]
-            block_lines.append(line)
-            if not record_seen and re.search(r"\brecord\b", line, re.IGNORECASE):
-                record_seen = True
-            if record_seen:
-                if re.search(r"\bend\s+record\s*;", line, re.IGNORECASE):
-                    break
-            else:
-                if ";" in line:
-                    break
-            i += 1
-        return "\n".join(block_lines), i
+        return _normalize_name_cached(name, self.root)
+
+    @staticmethod
+    def _collect_type_block(
+        text: str, scan_text: str, line_starts: List[int], start_idx: int
+    ) -> tuple[str, int]:
+        """Return the whole lines of the type declaration starting at line start_idx.
+
+        A declaration that mentions ``record`` before its first ``;`` line
+        runs to the next ``end record;`` line; otherwise it ends on the line
+        holding the first ``;``. The returned index is that last line, or
+        ``len(line_starts)`` if the text ends first.
+        """
+        start = line_starts[start_idx]
+        last_idx = len(line_starts) - 1
+        end_offset = scan_text.find(";", start)
+        if end_offset < 0:
+            search_stop = len(text)
+        else:
+            # Only a "record" on or before the first ";" line opens a record block
+            search_stop = scan_text.find("\n", end_offset)
+            if search_stop < 0:
+                search_stop = len(text)
+        record_kw = RECORD_KW_RE.search(scan_text, start, search_stop)
+        if record_kw:
+            record_line = bisect_right(line_starts, record_kw.start(), start_idx) - 1
+            end_record = END_RECORD_RE.search(scan_text, line_starts[record_line])
+            end_offset = end_record.start() if end_record else -1
+        if end_offset < 0:
+            return text[start:], len(line_starts)
+        end_idx = bisect_right(line_starts, end_offset, start_idx) - 1
+        stop = line_starts[end_idx + 1] - 1 if end_idx < last_idx else len(text)
+        return text[start:stop], end_idx
 
     def _parse_record_fields_block(
         self, block: str, pkg_segments: List[str]
     ) -> Optional[Dict[str, str]]:
         if "null record" in block.lower():
             return {}
-        match = re.search(r"\brecord\b(.*?)\bend\s+record", block, re.IGNORECASE | re.DOTALL)
+        match = RECORD_BODY_RE.search(block)
         if match is None:
             return None
         body = match.group(1)
@@ -168,30 +238,39 @@ class AdaSpecIndex:
         match = ENUM_BODY_RE.search(block)
         if match is None:
             return None
-        inner = match.group(1)
-        literals: List[str] = []
-        for part in inner.split(","):
-            lit = part.strip()
-            lit = lit.split("--", 1)[0].strip()
-            lit = lit.rstrip(")").rstrip(";").strip()
-            if lit:
-                literals.append(lit)
-        return tuple(literals) if literals else None
+        # Blocks arrive with comments already stripped by _parse
+        parts = (part.strip().rstrip(")").rstrip(";").strip() for part in match.group(1).split(","))
+        literals = tuple(lit for lit in parts if lit)
+        return literals or None
 
     def _parse(self) -> None:
         lines = self.text.splitlines()
-        stack: List[str] = []
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            stripped = line.strip()
-            if not stripped:
-                i += 1
-                continue
+        text = "\n".join(lines)
+        line_starts: List[int] = []
+        offset = 0
+        for line in lines:
+            line_starts.append(offset)
+            offset += len(line) + 1
+        line_at = {start: idx for idx, start in enumerate(line_starts)}
+        scan_text = text.lower()
+        if len(scan_text) != len(text):
+            # Some non-ASCII characters change length when lower-cased; Ada
+            # keywords are ASCII, so ASCII-only folding keeps offsets aligned.
+            scan_text = text.translate(_ASCII_LOWER)
 
-            pkg_start = PACKAGE_START_RE.match(stripped)
-            if pkg_start:
-                name = pkg_start.group(1)
+        stack: List[str] = []
+        pos = 0
+        # One regex scan over the whole text finds declaration lines; lines
+        # that declare nothing are skipped inside the regex engine.
+        while True:
+            m = DECL_SCAN_RE.search(scan_text, pos)
+            if m is None:
+                break
+            pos = m.end()
+            kind = m.lastgroup
+
+            if kind == "package":
+                name = text[m.start("package_name"):m.end("package_name")]
                 parts = name.split(".")
                 if not stack:
                     stack = parts.copy()
@@ -204,12 +283,10 @@ class AdaSpecIndex:
                         stack = parts.copy()
                         if not self.root:
                             self.root = parts[0]
-                i += 1
                 continue
 
-            pkg_end = PACKAGE_END_RE.match(stripped)
-            if pkg_end:
-                name = pkg_end.group(1)
+            if kind == "end":
+                name = text[m.start("end_name"):m.end("end_name")] if m.start("end_name") >= 0 else None
                 if stack:
                     if name:
                         parts = name.split(".")
@@ -223,93 +300,108 @@ class AdaSpecIndex:
                                 stack = stack[:-len(lowered_parts)]
                     else:
                         stack.pop()
-                i += 1
                 continue
 
-            subtype_match = SUBTYPE_RE.match(stripped)
-            if subtype_match:
-                type_name = subtype_match.group(1)
-                base_expr = subtype_match.group(2)
+            if kind == "subtype":
+                type_name = text[m.start("subtype_name"):m.end("subtype_name")]
+                base_expr = text[m.start("subtype_base"):m.end("subtype_base")]
                 key = self._qualified_name(stack, type_name)
                 qualified = self._qualify_reference(self._current_segments(stack), base_expr)
                 self.subtypes[key] = qualified
                 self.declared_types.add(key)
-                i += 1
                 continue
 
-            type_match = TYPE_DECL_RE.match(stripped)
-            if type_match:
-                type_name = type_match.group(1)
-                block, block_end = self._collect_type_block(lines, i)
-                current_segments = self._current_segments(stack)
-                key = self._qualified_name(stack, type_name)
+            type_name = text[m.start("type_name"):m.end("type_name")]
+            block, block_end = self._collect_type_block(
+                text, scan_text, line_starts, line_at[m.start()]
+            )
+            # Resume scanning after the type block so its body lines are not
+            # mistaken for declarations (e.g. "end record;")
+            if block_end + 1 < len(lines):
+                pos = line_starts[block_end + 1]
+            else:
+                pos = len(text)
+            current_segments = self._current_segments(stack)
+            key = self._qualified_name(stack, type_name)
+            if "--" in block:
                 block_no_comments = "\n".join(line.split("--", 1)[0] for line in block.splitlines())
+            else:
+                block_no_comments = block
 
-                record_fields = self._parse_record_fields_block(block_no_comments, current_segments)
-                if record_fields is not None:
-                    self.records[key] = record_fields
-                    self.declared_types.add(key)
-                    i = block_end + 1
-                    continue
-
-                array_info = self._parse_array_block(block_no_comments, current_segments)
-                if array_info is not None:
-                    component, dimension = array_info
-                    self.arrays[key] = component
-                    self.array_dims[key] = dimension
-                    self.declared_types.add(key)
-                    i = block_end + 1
-                    continue
-
-                enum_literals = self._parse_enum_block(block_no_comments)
-                if enum_literals is not None:
-                    self.enums[key] = enum_literals
-                    self.declared_types.add(key)
-                    i = block_end + 1
-                    continue
+            record_fields = self._parse_record_fields_block(block_no_comments, current_segments)
+            if record_fields is not None:
+                self.records[key] = record_fields
+                self.declared_types.add(key)
+                continue
 
-                i = block_end + 1
+            array_info = self._parse_array_block(block_no_comments, current_segments)
+            if array_info is not None:
+                component, dimension = array_info
+                self.arrays[key] = component
+                self.array_dims[key] = dimension
+                self.declared_types.add(key)
                 continue
 
-            i += 1
+            enum_literals = self._parse_enum_block(block_no_comments)
+            if enum_literals is not None:
+                self.enums[key] = enum_literals
+                self.declared_types.add(key)
+
+    def _flatten_subtypes(self) -> None:
+        """Resolve every subtype chain once so subtype names hit the tables directly."""
+        for key in list(self.subtypes):
+            self.resolve_record_fields(key)
+            self.resolve_array_element(key)
+            self.resolve_array_dimension(key)
+            self.resolve_enum_literals(key)
 
     def _resolve(
         self,
         name: str,
         lookup: Dict[str, Any],
-        seen: set[str],
         transform: Optional[Callable[[Any], Any]] = None,
     ) -> Optional[Any]:
-        key = self.normalize_name(name)
-        if not key or key in seen:
-            return None
-        if key in lookup:
-            value = lookup[key]
+        # Fast path: exact names are served straight from the parsed tables
+        if name in lookup:
+            value = lookup[name]
             return transform(value) if transform else value
-        seen.add(key)
-        base_expr = self.subtypes.get(key)
-        if not base_expr:
-            return None
-        base_name = self.normalize_name(base_expr)
-        if not base_name:
+        key = self.normalize_name(name)
+        if not key:
             return None
-        result = self._resolve(base_name, lookup, seen, transform)
+        # Follow the subtype chain, remembering each alias so the result can
+        # be cached under all of them
+        chain: List[str] = []
+        while key not in lookup:
+            base_expr = self.subtypes.get(key)
+            if not base_expr:
+                return None
+            chain.append(key)
+            base_name = self.normalize_name(base_expr)
+            if not base_name:
+                return None
+            if base_name not in lookup:
+                base_name = self.normalize_name(base_name)
+                if not base_name or base_name in chain:
+                    return None
+            key = base_name
+        value = lookup[key]
+        result = transform(value) if transform else value
         if result is not None:
-            lookup[key] = result
+            for alias in chain:
+                lookup[alias] = result
         return result
 
-    def resolve_record_fields(self, name: str, seen: set[str]) -> Optional[Dict[str, str]]:
-        return self._resolve(name, self.records, seen)
+    def resolve_record_fields(self, name: str) -> Optional[Dict[str, str]]:
+        return self._resolve(name, self.records)
 
-    def resolve_array_element(self, name: str, seen: set[str]) -> Optional[str]:
-        return self._resolve(name, self.arrays, seen, self._clean_reference)
+    def resolve_array_element(self, name: str) -> Optional[str]:
+        return self._resolve(name, self.arrays, self._clean_reference)
 
-    def resolve_array_dimension(self, name: str, seen: set[str]) -> Optional[int]:
-        return self._resolve(name, self.array_dims, seen)
-
-    def resolve_enum_literals(self, name: str, seen: set[str]) -> Optional[List[str]]:
-        return self._resolve(name, self.enums, seen, lambda items: list(items))
+    def resolve_array_dimension(self, name: str) -> Optional[int]:
+        return self._resolve(name, self.array_dims)
 
+    def resolve_enum_literals(self, name: str) -> Optional[List[str]]:
+        return self._resolve(name, self.enums, lambda items: list(items))
 
 class RegexTypesProvider:
     """
@@ -336,25 +428,25 @@ class RegexTypesProvider:
 
     def get_record_fields(self, domain: str, type_name: str) -> Optional[Dict[str, str]]:
         try:
-            return self._index(domain).resolve_record_fields(type_name, set())
+            return self._index(domain).resolve_record_fields(type_name)
         except Exception:
             return None
 
     def get_array_element_type(self, domain: str, type_name: str) -> Optional[str]:
         try:
-            return self._index(domain).resolve_array_element(type_name, set())
+            return self._index(domain).resolve_array_element(type_name)
         except Exception:
             return None
 
     def get_enum_literals(self, domain: str, type_name: str) -> Optional[List[str]]:
         try:
-            return self._index(domain).resolve_enum_literals(type_name, set())
+            return self._index(domain).resolve_enum_literals(type_name)
         except Exception:
             return None
 
     def get_array_dimension(self, domain: str, type_name: str) -> Optional[int]:
         try:
-            return self._index(domain).resolve_array_dimension(type_name, set())
+            return self._index(domain).resolve_array_dimension(type_name)
         except Exception:
             return None
 
@@ -367,43 +459,118 @@ class LibadalangTypesProvider:
     Note: This is a best-effort minimal implementation to support direct
     record and array declarations. It does not yet resolve derived/renamed
     types or GPR projects; those can be added incrementally.
+
+    All instances share one AnalysisContext, so a spec file parsed by one
+    provider is reused by later providers in the same process until the
+    file changes on disk. A reparse invalidates the old tree's nodes, so
+    every provider drops what it built from a unit once the shared
+    context has moved on.
     """
 
+    _shared_ctx: Any = None
+    # File stamps of the units last loaded into the shared context
+    _unit_stamps: dict[Path, Tuple[int, int]] = {}
+
     def __init__(self, types_from_ads: Path, types_to_ads: Path) -> None:
         self.paths = {"from": types_from_ads, "to": types_to_ads}
+        self._decl_index: dict[str, dict[str, Any]] = {}
+        # (method, domain, type_name) -> result, including None for misses
+        self._results: dict[tuple[str, str, str], Any] = {}
+        # domain -> (resolved path, stamp) of the unit this provider has indexed
+        self._loaded: dict[str, tuple[Path, Tuple[int, int]]] = {}
         try:
             import libadalang as lal  # type: ignore
             self.lal = lal
-            self.ctx = lal.AnalysisContext()
+            if LibadalangTypesProvider._shared_ctx is None:
+                LibadalangTypesProvider._shared_ctx = lal.AnalysisContext()
+            self.ctx = LibadalangTypesProvider._shared_ctx
             self.units: dict[str, object] = {}
+            # The enum type-definition class name differs across libadalang versions
+            self._enum_cls: tuple[type, ...] = tuple(
+                c for c in (getattr(lal, "EnumTypeDef", None), getattr(lal, "EnumerationTypeDef", None)) if c is not None
+            )
             self._fallback = None
         except Exception:
             self.lal = None  # type: ignore
             self.ctx = None  # type: ignore
             self.units = {}
+            self._enum_cls = ()
             from types_provider import RegexTypesProvider as _RTP
             self._fallback = _RTP(types_from_ads, types_to_ads)
 
     def _unit(self, domain: str):
         if domain not in self.units:
-            self.units[domain] = self.ctx.get_from_file(str(self.paths[domain]))
+            path = self.paths[domain].resolve()
+            stamp = _file_stamp(path)
+            stamps = LibadalangTypesProvider._unit_stamps
+            # The context outlives providers, so reparse files edited since they were loaded
+            reparse = stamps.get(path, stamp) != stamp
+            self.units[domain] = self.ctx.get_from_file(str(path), reparse=reparse)
+            stamps[path] = stamp
+            self._loaded[domain] = (path, stamp)
         return self.units[domain]
 
-    def _find_type_decl(self, domain: str, type_name: str):
+    def _drop_if_reparsed(self, domain: str) -> None:
+        loaded = self._loaded.get(domain)
+        if loaded is None:
+            return
+        path, stamp = loaded
+        if LibadalangTypesProvider._unit_stamps.get(path) == stamp:
+            return
+        # Another load reparsed this file; nodes from the old tree are stale
+        del self._loaded[domain]
+        self.units.pop(domain, None)
+        self._decl_index.pop(domain, None)
+        self._results = {key: value for key, value in self._results.items() if key[1] != domain}
+
+    def _iter_type_decls(self, root: Any) -> Iterator[Any]:
+        """Yield TypeDecl nodes in source order, skipping type definitions and bodies."""
         lal = self.lal
-        u = self._unit(domain)
-        for decl in u.root.findall(lal.TypeDecl):
-            try:
-                name = decl.f_decl_id.text
-            except Exception:
+        type_decl = lal.TypeDecl
+        # Type declarations never nest inside another type declaration, and
+        # anything declared inside a body is not visible from the spec
+        body = getattr(lal, "BodyNode", None)
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node is None:
                 continue
-            if name == type_name:
-                return decl
-        return None
+            if isinstance(node, type_decl):
+                yield node
+                continue
+            if body is not None and isinstance(node, body):
+                continue
+            stack.extend(reversed(node.children))
+
+    def _find_type_decl(self, domain: str, type_name: str):
+        index = self._decl_index.get(domain)
+        if index is None:
+            # Walk the unit once and serve later lookups by name
+            index = {}
+            for decl in self._iter_type_decls(self._unit(domain).root):
+                try:
+                    name = decl.f_decl_id.text
+                except Exception:
+                    continue
+                index.setdefault(name, decl)
+            self._decl_index[domain] = index
+        return index.get(type_name)
+
+    def _memo(self, method: str, domain: str, type_name: str, compute: Callable[[str, str], Any]) -> Any:
+        self._drop_if_reparsed(domain)
+        key = (method, domain, type_name)
+        try:
+            return self._results[key]
+        except KeyError:
+            result = self._results[key] = compute(domain, type_name)
+            return result
 
     def get_record_fields(self, domain: str, type_name: str) -> Optional[dict[str, str]]:
         if self.lal is None:
             return self._fallback.get_record_fields(domain, type_name) if self._fallback else None
+        return self._memo("record", domain, type_name, self._lal_record_fields)
+
+    def _lal_record_fields(self, domain: str, type_name: str) -> Optional[dict[str, str]]:
         lal = self.lal
         decl = self._find_type_decl(domain, type_name)
         if not decl:
@@ -440,10 +607,11 @@ class LibadalangTypesProvider:
         return fields or None
 
     def get_array_element_type(self, domain: str, type_name: str) -> Optional[str]:
-        if self.lal is None:
-            return self._fallback.get_record_fields(domain, type_name) if self._fallback else None
         if self.lal is None:
             return self._fallback.get_array_element_type(domain, type_name) if self._fallback else None
+        return self._memo("array", domain, type_name, self._lal_array_element_type)
+
+    def _lal_array_element_type(self, domain: str, type_name: str) -> Optional[str]:
         lal = self.lal
         decl = self._find_type_decl(domain, type_name)
         if not decl:
@@ -462,14 +630,14 @@ class LibadalangTypesProvider:
     def get_enum_literals(self, domain: str, type_name: str) -> Optional[List[str]]:
         if self.lal is None:
             return self._fallback.get_enum_literals(domain, type_name) if self._fallback else None
-        lal = self.lal
+        return self._memo("enum", domain, type_name, self._lal_enum_literals)
+
+    def _lal_enum_literals(self, domain: str, type_name: str) -> Optional[List[str]]:
         decl = self._find_type_decl(domain, type_name)
         if not decl:
             return None
         tdef = decl.f_type_def
-        # Try to detect enum-like type definition class names without importing specific symbols
-        kind = type(tdef).__name__ if tdef is not None else ""
-        if kind not in ("EnumTypeDef", "EnumerationTypeDef"):
+        if not self._enum_cls or not isinstance(tdef, self._enum_cls):
             return None
         # Attempt to extract literals; this may vary by version
         try:
@@ -481,6 +649,9 @@ class LibadalangTypesProvider:
     def get_array_dimension(self, domain: str, type_name: str) -> Optional[int]:
         if self.lal is None:
             return self._fallback.get_array_dimension(domain, type_name) if self._fallback else None
+        return self._memo("dims", domain, type_name, self._lal_array_dimension)
+
+    def _lal_array_dimension(self, domain: str, type_name: str) -> Optional[int]:
         lal = self.lal
         decl = self._find_type_decl(domain, type_name)
         if not decl:
@@ -1,81 +1,113 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 from generator import MapperGenerator
 from constants import DEFAULT_SENTINEL
 
 
 def is_placeholder(value: object) -> bool:
-    return isinstance(value, str) and value.startswith("<") and value.endswith(">")
+    return isinstance(value, str) and value[:1] == "<" and value[-1:] == ">"
 
 
 def is_default_sentinel(value: object) -> bool:
-    return isinstance(value, str) and value.strip().upper() == DEFAULT_SENTINEL
+    # The sentinel is built from underscores, which have no case mapping, so
+    # most field names and literals are rejected before strip()/upper()
+    return isinstance(value, str) and "_" in value and value.strip().upper() == DEFAULT_SENTINEL
 
 
-EnumCache = Dict[str, Dict[str, Tuple[str, ...]]]
-FieldLookup = Dict[str, Tuple[str, str]]
+# Enum literals in declaration order plus a lower-cased name -> literal map
+EnumInfo = Tuple[Tuple[str, ...], Dict[str, str]]
+EnumCache = Dict[str, Dict[str, EnumInfo]]
+# Lower-cased field name -> declared name, and lower-cased field name -> stripped type
+FieldLookup = Tuple[Dict[str, str], Dict[str, str]]
+
+_NO_ENUM: EnumInfo = ((), {})
+
+
+class SourceRef(NamedTuple):
+    """A stripped source reference with the checks every caller branches on."""
+
+    text: str
+    dotted: bool
+    default: bool
+
+
+def _classify_ref(value: str) -> SourceRef:
+    text = value.strip()
+    return SourceRef(text, "." in text, is_default_sentinel(text))
 
 
 def _build_lookup(fields: Dict[str, str]) -> FieldLookup:
-    return {name.lower(): (name, fields[name]) for name in fields}
+    names: Dict[str, str] = {}
+    types: Dict[str, str] = {}
+    for name, type_name in fields.items():
+        key = name.lower()
+        names[key] = name
+        types[key] = type_name.strip()
+    return names, types
 
 
-def _enum_literals(
+def _enum_info(
     domain: str, type_name: Optional[str], provider, cache: EnumCache
-) -> Tuple[str, ...]:
+) -> EnumInfo:
     if not type_name:
-        return ()
+        return _NO_ENUM
     type_key = type_name.strip()
     if not type_key:
-        return ()
+        return _NO_ENUM
     domain_cache = cache.setdefault(domain, {})
-    if type_key in domain_cache:
-        return domain_cache[type_key]
-    literals = provider.get_enum_literals(domain, type_key) or ()
-    if not isinstance(literals, tuple):
-        literals = tuple(literals)
-    domain_cache[type_key] = literals
-    return literals
+    info = domain_cache.get(type_key)
+    if info is None:
+        literals = provider.get_enum_literals(domain, type_key) or ()
+        if not isinstance(literals, tuple):
+            literals = tuple(literals)
+        info = (literals, {lit.lower(): lit for lit in literals})
+        domain_cache[type_key] = info
+    return info
+
+
+def _enum_literals(
+    domain: str, type_name: Optional[str], provider, cache: EnumCache
+) -> Tuple[str, ...]:
+    return _enum_info(domain, type_name, provider, cache)[0]
 
 
 def _resolve_source_reference(
-    reference: str,
+    ref: SourceRef,
     *,
     ctx: str,
     dest_field: str,
     mg: MapperGenerator,
     from_type: Optional[str],
-    from_lookup: FieldLookup,
+    from_types: Dict[str, str],
     errors: List[str],
 ) -> Optional[str]:
-    ref_clean = reference.strip()
-    if is_default_sentinel(ref_clean):
+    if ref.default:
         return DEFAULT_SENTINEL
-    if "." in ref_clean:
+    if ref.dotted:
         if from_type and from_type != DEFAULT_SENTINEL:
-            resolved = mg.resolve_src_path_type(from_type, ref_clean)
+            resolved = mg.resolve_src_path_type(from_type, ref.text)
             if resolved is None:
                 errors.append(
-                    f"{ctx}: field '{dest_field}' references unknown source path '{reference}'"
+                    f"{ctx}: field '{dest_field}' references unknown source path '{ref.text}'"
                 )
                 return None
             return resolved.strip()
         errors.append(
-            f"{ctx}: field '{dest_field}' uses dotted path '{reference}' but source type is missing"
+            f"{ctx}: field '{dest_field}' uses dotted path '{ref.text}' but source type is missing"
         )
         return None
-    if not from_lookup:
+    if not from_types:
         return None
-    match = from_lookup.get(ref_clean.lower())
-    if not match:
+    match = from_types.get(ref.text.lower())
+    if match is None:
         errors.append(
-            f"{ctx}: field '{dest_field}' references unknown source field '{reference}' in type '{from_type}'"
+            f"{ctx}: field '{dest_field}' references unknown source field '{ref.text}' in type '{from_type}'"
         )
         return None
-    return match[1].strip()
+    return match
 
 
 def _validate_enum_override(
@@ -93,19 +125,20 @@ def _validate_enum_override(
             f"{ctx}: field '{dest_field}' has 'enum_map' but it must be an object"
         )
         return
-    dest_literals = _enum_literals("to", dest_type, provider, cache)
-    src_literals = (
-        _enum_literals("from", source_type, provider, cache)
+    if not enum_map:
+        # Nothing to check, and generation treats an empty override as absent
+        return
+    dest_literals, dest_lookup = _enum_info("to", dest_type, provider, cache)
+    src_literals, src_lookup = (
+        _enum_info("from", source_type, provider, cache)
         if source_type and source_type != DEFAULT_SENTINEL
-        else ()
+        else _NO_ENUM
     )
     if not dest_literals or not src_literals:
         errors.append(
             f"{ctx}: field '{dest_field}' provides 'enum_map' but either source '{source_type}' or destination '{dest_type}' is not an enum"
         )
         return
-    dest_lookup = {lit.lower(): lit for lit in dest_literals}
-    src_lookup = {lit.lower(): lit for lit in src_literals}
     for raw_src, raw_dst in enum_map.items():
         if not isinstance(raw_src, str) or not isinstance(raw_dst, str):
             errors.append(
@@ -124,24 +157,24 @@ def _validate_enum_override(
 
 def validate_mappings(mappings: List[dict], provider) -> List[str]:
     errors: List[str] = []
-    mg = MapperGenerator(provider, set())
-
-    mapping_pairs = set()
-    for entry in mappings:
-        src = entry.get("from")
-        dst = entry.get("to")
-        if isinstance(src, str) and isinstance(dst, str) and not is_placeholder(src):
-            mapping_pairs.add((src.strip(), dst.strip()))
-    mg.mapping_pairs = mapping_pairs
-
+    mapping_pairs = {
+        (src.strip(), dst.strip())
+        for src, dst in ((entry.get("from"), entry.get("to")) for entry in mappings)
+        if isinstance(src, str) and isinstance(dst, str) and not is_placeholder(src)
+    }
+    mg = MapperGenerator(provider, mapping_pairs)
+
+    # Shared by every entry so each enum type is looked up once per run
+    enum_cache: EnumCache = {"to": {}, "from": {}}
     for entry in mappings:
-        errors.extend(_validate_mapping_entry(entry, mg, provider))
+        errors.extend(_validate_mapping_entry(entry, mg, provider, enum_cache))
     return errors
 
 
-def _validate_mapping_entry(entry: dict, mg: MapperGenerator, provider) -> List[str]:
+def _validate_mapping_entry(
+    entry: dict, mg: MapperGenerator, provider, enum_cache: EnumCache
+) -> List[str]:
     errors: List[str] = []
-    enum_cache: EnumCache = {"to": {}, "from": {}}
 
     name = entry.get("name")
     to_type_raw = entry.get("to")
@@ -197,62 +230,52 @@ def _validate_mapping_entry(entry: dict, mg: MapperGenerator, provider) -> List[
         errors.append(f"{ctx}: 'fields' must be an object mapping destination fields to sources")
         return errors
 
-    dest_lookup = _build_lookup(dest_fields)
-    dest_field_keys_lower = {field.lower() for field in fields_entry}
-    missing_fields = [
-        field
-        for field in dest_fields
-        if field.lower() not in dest_field_keys_lower
-    ]
-    if missing_fields:
+    dest_names, dest_types = _build_lookup(dest_fields)
+    # Lower-case the mapped field names once for the coverage checks and the field loop
+    entry_keys_lower = [field.lower() for field in fields_entry]
+    entry_keys_lower_set = set(entry_keys_lower)
+    # Set differences find the (usually empty) gaps; the ordered lists are
+    # only built when there is something to report
+    missing_keys = dest_names.keys() - entry_keys_lower_set
+    if missing_keys:
+        missing_fields = [field for key, field in dest_names.items() if key in missing_keys]
         errors.append(
             f"{ctx}: missing mappings for destination fields {', '.join(missing_fields)} in type '{to_type}'"
         )
 
-    extra_fields = [field for field in fields_entry if field.lower() not in dest_lookup]
-    for extra in extra_fields:
-        errors.append(
-            f"{ctx}: destination field '{extra}' does not exist in type '{to_type}'"
-        )
+    if entry_keys_lower_set - dest_names.keys():
+        for field, key in zip(fields_entry, entry_keys_lower):
+            if key not in dest_names:
+                errors.append(
+                    f"{ctx}: destination field '{field}' does not exist in type '{to_type}'"
+                )
 
-    from_lookup = _build_lookup(from_fields)
+    from_types = _build_lookup(from_fields)[1]
 
-    for dest_field, spec in fields_entry.items():
-        lookup = dest_lookup.get(dest_field.lower())
-        if not lookup:
+    for spec, key in zip(fields_entry.values(), entry_keys_lower):
+        dest_actual = dest_names.get(key)
+        if dest_actual is None:
             continue
-        dest_actual, dest_type_raw = lookup
-        dest_type = dest_type_raw.strip()
+        dest_type = dest_types[key]
 
         source_type: Optional[str] = None
 
         if isinstance(spec, str):
-            spec_value = spec.strip()
-            if is_placeholder(spec_value):
+            ref = _classify_ref(spec)
+            if is_placeholder(ref.text):
                 errors.append(
-                    f"{ctx}: field '{dest_actual}' still uses placeholder value '{spec_value}'"
+                    f"{ctx}: field '{dest_actual}' still uses placeholder value '{ref.text}'"
                 )
                 continue
-            if is_default_sentinel(spec_value):
-                continue
-            if "." in spec_value and (not from_type or from_type == DEFAULT_SENTINEL):
-                errors.append(
-                    f"{ctx}: field '{dest_actual}' uses dotted path '{spec_value}' but source type is missing"
-                )
-                continue
-            if "." not in spec_value and not from_lookup:
-                continue
-            resolved = _resolve_source_reference(
-                spec_value,
+            source_type = _resolve_source_reference(
+                ref,
                 ctx=ctx,
                 dest_field=dest_actual,
                 mg=mg,
                 from_type=from_type,
-                from_lookup=from_lookup,
+                from_types=from_types,
                 errors=errors,
             )
-            if resolved is not None:
-                source_type = resolved
 
         elif isinstance(spec, dict):
             src_ref = spec.get("from") or spec.get("source") or spec.get("path")
@@ -266,28 +289,15 @@ def _validate_mapping_entry(entry: dict, mg: MapperGenerator, provider) -> List[
                     f"{ctx}: field '{dest_actual}' still uses placeholder value '{src_ref}'"
                 )
                 continue
-            src_ref_str = str(src_ref).strip()
-            if is_default_sentinel(src_ref_str):
-                source_type = DEFAULT_SENTINEL
-            else:
-                if "." in src_ref_str and (not from_type or from_type == DEFAULT_SENTINEL):
-                    errors.append(
-                        f"{ctx}: field '{dest_actual}' uses dotted path '{src_ref_str}' but source type is missing"
-                    )
-                elif "." not in src_ref_str and not from_lookup:
-                    pass
-                else:
-                    resolved = _resolve_source_reference(
-                        src_ref_str,
-                        ctx=ctx,
-                        dest_field=dest_actual,
-                        mg=mg,
-                        from_type=from_type,
-                        from_lookup=from_lookup,
-                        errors=errors,
-                    )
-                    if resolved is not None:
-                        source_type = resolved
+            source_type = _resolve_source_reference(
+                _classify_ref(str(src_ref)),
+                ctx=ctx,
+                dest_field=dest_actual,
+                mg=mg,
+                from_type=from_type,
+                from_types=from_types,
+                errors=errors,
+            )
 
             if "enum_map" in spec:
                 _validate_enum_override(
@@ -335,15 +345,15 @@ def _validate_enum_entry(
     if not isinstance(from_type_raw, str) or not from_type_raw.strip():
         errors.append(f"{ctx}: source type ('from') is missing for enum mapping")
         from_type = None
-        from_literals: List[str] = []
+        from_literals, from_lookup = _NO_ENUM
     elif is_default_sentinel(from_type_raw):
         from_type = DEFAULT_SENTINEL
-        from_literals = []
+        from_literals, from_lookup = _NO_ENUM
     else:
         if is_placeholder(from_type_raw):
             errors.append(f"{ctx}: source type is still a placeholder '{from_type_raw}'")
         from_type = from_type_raw.strip()
-        from_literals = list(_enum_literals("from", from_type, provider, cache))
+        from_literals, from_lookup = _enum_info("from", from_type, provider, cache)
         if not from_literals:
             errors.append(
                 f"{ctx}: source type '{from_type}' not found or is not an enum in source specs"
@@ -353,8 +363,7 @@ def _validate_enum_entry(
         errors.append(f"{ctx}: 'fields' must be an object mapping enum literals")
         return errors
 
-    dest_lookup = {lit.lower(): lit for lit in dest_literals}
-    from_lookup = {lit.lower(): lit for lit in from_literals}
+    dest_literal_set = set(dest_literals)
 
     missing = [lit for lit in dest_literals if lit not in fields_entry]
     if missing:
@@ -363,7 +372,7 @@ def _validate_enum_entry(
         )
 
     for dest_lit, src_spec in fields_entry.items():
-        if dest_lit not in dest_lookup.values():
+        if dest_lit not in dest_literal_set:
             errors.append(
                 f"{ctx}: destination literal '{dest_lit}' does not exist in enum '{to_type}'"
             )